@@ -2,9 +2,9 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Q, Sum, Count
+from django.db.models import Prefetch, Q, Sum, Count
 from django.core.paginator import Paginator
-from .models import Product, ProductVariant, Combo, Order, OrderItem
+from .models import Product, ProductVariant, Combo, ComboProduct, Order, OrderItem
 from .forms import (
     ProductForm,
     ProductVariantForm,
@@ -18,12 +18,18 @@ from .forms import (
 # @staff_member_required
 def admin_dashboard(request):
     """Main admin dashboard with statistics"""
+    # One aggregate covers all three order counters
+    order_stats = Order.objects.aggregate(
+        total=Count('id'),
+        new=Count('id', filter=Q(status='new')),
+        processing=Count('id', filter=Q(status='processing')),
+    )
     context = {
         'total_products': Product.objects.filter(is_active=True).count(),
         'total_combos': Combo.objects.filter(is_active=True).count(),
-        'total_orders': Order.objects.count(),
-        'new_orders': Order.objects.filter(status='new').count(),
-        'processing_orders': Order.objects.filter(status='processing').count(),
+        'total_orders': order_stats['total'],
+        'new_orders': order_stats['new'],
+        'processing_orders': order_stats['processing'],
         'recent_orders': Order.objects.all()[:5],
         'featured_products': Product.objects.filter(is_featured=True, is_active=True)[:5],
     }
@@ -35,7 +41,10 @@ def admin_dashboard(request):
 # @staff_member_required
 def product_list(request):
     """List all products with search and filter"""
-    products = Product.objects.all()
+    # Annotated so the template's variant badge doesn't COUNT per row
+    products = Product.objects.annotate(
+        variant_count=Count('variants')
+    ).order_by('-created_at')
     
     # Search
     search_query = request.GET.get('search', '')
@@ -222,24 +231,34 @@ def variant_delete(request, pk):
 
 def _product_variant_map():
     """Build a lightweight mapping of product -> its active variants for the UI."""
-    products = Product.objects.filter(is_active=True).prefetch_related('variants')
-    mapping = {}
+    variants = ProductVariant.objects.filter(
+        is_active=True,
+        product__is_active=True
+    ).order_by('created_at').values('id', 'product_id', 'ml', 'price')
 
-    for product in products:
-        mapping[str(product.id)] = [
-            {
-                'id': str(variant.id),
-                'label': f"{variant.ml}ml - ₹{variant.price}"
-            }
-            for variant in product.variants.filter(is_active=True)
-        ]
+    mapping = {}
+    for variant in variants:
+        mapping.setdefault(str(variant['product_id']), []).append({
+            'id': str(variant['id']),
+            'label': f"{variant['ml']}ml - ₹{variant['price']}"
+        })
 
     return mapping
 
 # @staff_member_required
 def combo_list(request):
     """List all combos"""
-    combos = Combo.objects.all()
+    # The template renders original_price/discounted_price per combo, so
+    # prefetch combo_products with their variants to keep pricing off the
+    # per-row query path
+    combos = Combo.objects.annotate(
+        product_count=Count('products')
+    ).prefetch_related(
+        Prefetch(
+            'combo_products',
+            queryset=ComboProduct.objects.select_related('variant')
+        )
+    ).order_by('-created_at')
     
     # Search
     search_query = request.GET.get('search', '')
@@ -340,12 +359,14 @@ def combo_detail(request, pk):
     """View combo details"""
     combo = get_object_or_404(
         Combo.objects.prefetch_related(
-            'combo_products__product',
-            'combo_products__variant'
+            Prefetch(
+                'combo_products',
+                queryset=ComboProduct.objects.select_related('product', 'variant')
+            )
         ),
         pk=pk
     )
-    combo_products = combo.combo_products.select_related('product', 'variant')
+    combo_products = combo.combo_products.all()
     
     return render(request, 'admin_dashboard/combo_detail.html', {
         'combo': combo,
@@ -408,7 +429,7 @@ def order_list(request):
 def order_detail(request, pk):
     """View order details"""
     order = get_object_or_404(Order, pk=pk)
-    items = order.items.all()
+    items = order.items.select_related('product', 'combo', 'variant')
     
     # Handle status update
     if request.method == 'POST':
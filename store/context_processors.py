@@ -0,0 +1,6 @@
+from .views import get_site_config
+
+
+def site_config(request):
+    """Expose the cached site configuration to every template."""
+    return {'site_config': get_site_config()}
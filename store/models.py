@@ -1,11 +1,27 @@
 from django.db import models
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.utils.text import slugify
 from django.utils import timezone
+import time
 import uuid
 
 
+def _generate_unique_slug(instance, source, fallback):
+    """Slugify source for instance's model, suffixing until the slug is unique."""
+    base_slug = slugify(source) or fallback
+    slug_candidate = base_slug
+    counter = 1
+
+    model = type(instance)
+    while model.objects.filter(slug=slug_candidate).exclude(pk=instance.pk).exists():
+        slug_candidate = f"{base_slug}-{counter}"
+        counter += 1
+
+    return slug_candidate
+
+
 class Product(models.Model):
     ORIGIN_CHOICES = [
         ('france', 'France'),
@@ -41,7 +57,7 @@ class Product(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = _generate_unique_slug(self, self.name, 'product')
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -103,26 +119,16 @@ class Combo(models.Model):
     class Meta:
         ordering = ['-created_at']
 
-    def _generate_unique_slug(self):
-        """Create a unique slug from the title, appending a suffix if needed."""
-        base_slug = slugify(self.title) or 'combo'
-        slug_candidate = base_slug
-        counter = 1
-
-        while type(self).objects.filter(slug=slug_candidate).exclude(pk=self.pk).exists():
-            slug_candidate = f"{base_slug}-{counter}"
-            counter += 1
-
-        return slug_candidate
-
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = self._generate_unique_slug()
+            self.slug = _generate_unique_slug(self, self.title, 'combo')
         super().save(*args, **kwargs)
 
     def original_price(self):
         """Sum the prices of selected variants in this combo, with a safe fallback."""
-        items = self.combo_products.select_related('variant')
+        # .all() reuses the combo_products/variant prefetch when the caller
+        # fetched it, instead of forcing a fresh query per price lookup
+        items = self.combo_products.all()
         total = Decimal('0.00')
         has_items = False
 
@@ -259,6 +265,28 @@ class OrderItem(models.Model):
         return f"{self.item_type} - {self.order.order_number}"
 
 
+CATALOG_VERSION_KEY = 'catalog_version'
+
+
+def get_catalog_version():
+    """Cache-busting token used to key cached catalog template fragments."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = int(time.time())
+        cache.set(CATALOG_VERSION_KEY, version, None)
+    return version
+
+
+def _bump_catalog_version(sender, **kwargs):
+    """Drop the token whenever catalog data changes so fragments re-render."""
+    cache.delete(CATALOG_VERSION_KEY)
+
+
+for _catalog_model in (Product, ProductVariant, Combo, ComboProduct):
+    models.signals.post_save.connect(_bump_catalog_version, sender=_catalog_model)
+    models.signals.post_delete.connect(_bump_catalog_version, sender=_catalog_model)
+
+
 class SiteConfig(models.Model):
     site_name = models.CharField(max_length=100, default="Sulthan Fragrance")
     phone = models.CharField(max_length=20)
@@ -271,3 +299,14 @@ class SiteConfig(models.Model):
 
     def __str__(self):
         return self.site_name
+
+
+SITE_CONFIG_CACHE_KEY = 'site_config'
+
+
+def _drop_site_config_cache(sender, **kwargs):
+    cache.delete(SITE_CONFIG_CACHE_KEY)
+
+
+models.signals.post_save.connect(_drop_site_config_cache, sender=SiteConfig)
+models.signals.post_delete.connect(_drop_site_config_cache, sender=SiteConfig)
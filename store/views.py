@@ -1,41 +1,69 @@
+from django.core.exceptions import ValidationError
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
-from .models import Product, Combo, Order, OrderItem, SiteConfig, ProductVariant
+from django.db import transaction
+from django.db.models import Prefetch
+from django.core.cache import cache
+from .models import (
+    Product, Combo, ComboProduct, Order, OrderItem, SiteConfig, ProductVariant,
+    get_catalog_version, SITE_CONFIG_CACHE_KEY
+)
 import json
+import uuid
+
+
+def _parse_uuid(value):
+    """Return value as a UUID, or None if it doesn't parse as one."""
+    try:
+        return uuid.UUID(str(value))
+    except (ValueError, TypeError, AttributeError):
+        return None
 
 
 def get_site_config():
-    """Helper to get site configuration"""
-    config, _ = SiteConfig.objects.get_or_create(
-        id=1,
-        defaults={
-            'site_name': 'Sulthan Fragrance',
-            'phone': '9746 124 520',
-            'email': 'sulthanfragrance@gmail.com',
-            'instagram_url': 'https://www.instagram.com/sulthanfragrance_official',
-            'location': 'Kasaragod'
-        }
-    )
+    """Helper to get site configuration (cached between admin edits)"""
+    config = cache.get(SITE_CONFIG_CACHE_KEY)
+    if config is None:
+        config, _ = SiteConfig.objects.get_or_create(
+            id=1,
+            defaults={
+                'site_name': 'Sulthan Fragrance',
+                'phone': '9746 124 520',
+                'email': 'sulthanfragrance@gmail.com',
+                'instagram_url': 'https://www.instagram.com/sulthanfragrance_official',
+                'location': 'Kasaragod'
+            }
+        )
+        cache.set(SITE_CONFIG_CACHE_KEY, config, 3600)
     return config
 
 
 def home(request):
     """Landing page with products and combos"""
-    products = Product.objects.filter(is_active=True).prefetch_related('variants')
+    # The cards only show name/price/short_description, so skip the long
+    # description text when pulling catalog rows
+    products = list(
+        Product.objects.filter(is_active=True).defer(
+            'full_description'
+        ).prefetch_related('variants')
+    )
     combos = Combo.objects.filter(is_active=True).prefetch_related(
         'combo_products__product__variants',
         'combo_products__variant'
     )
-    featured_product = products.filter(is_featured=True).first() or products.first()
-    site_config = get_site_config()
-    
+    # Pick the featured product from the rows already in hand instead of
+    # issuing two extra ORDER BY ... LIMIT 1 queries
+    featured_product = (
+        next((p for p in products if p.is_featured), None)
+        or (products[0] if products else None)
+    )
     context = {
         'featured_product': featured_product,
         'products': products,
         'combos': combos,
-        'site_config': site_config,
+        'catalog_version': get_catalog_version(),
     }
     return render(request, 'store/home.html', context)
 
@@ -49,13 +77,13 @@ def product_detail(request, slug):
     )
     related_products = Product.objects.filter(
         is_active=True
-    ).exclude(id=product.id).prefetch_related('variants')[:3]
-    site_config = get_site_config()
-    
+    ).exclude(id=product.id).defer(
+        'full_description'
+    ).prefetch_related('variants')[:3]
     context = {
         'product': product,
         'related_products': related_products,
-        'site_config': site_config,
+        'catalog_version': get_catalog_version(),
     }
     return render(request, 'store/product_detail.html', context)
 
@@ -64,47 +92,50 @@ def combo_detail(request, slug):
     """Combo detail page"""
     combo = get_object_or_404(
         Combo.objects.prefetch_related(
-            'combo_products__product__variants',
-            'combo_products__variant'
+            Prefetch(
+                'combo_products',
+                queryset=ComboProduct.objects.select_related('product', 'variant')
+            ),
+            'combo_products__product__variants'
         ),
         slug=slug,
         is_active=True
     )
-    site_config = get_site_config()
-    combo_items = combo.combo_products.select_related('product', 'variant')
-    
+    # Walks the prefetched list; no second combo_products query
+    combo_items = combo.combo_products.all()
+
     context = {
         'combo': combo,
         'combo_items': combo_items,
-        'site_config': site_config,
     }
     return render(request, 'store/combo_detail.html', context)
 
 
 def cart(request):
     """Cart page"""
-    site_config = get_site_config()
-    context = {
-        'site_config': site_config,
-    }
-    return render(request, 'store/cart.html', context)
+    return render(request, 'store/cart.html')
 
 
 def checkout(request):
     """Checkout page"""
-    site_config = get_site_config()
-    context = {
-        'site_config': site_config,
-    }
-    return render(request, 'store/checkout.html', context)
+    return render(request, 'store/checkout.html')
 
 
 @require_http_methods(["POST"])
 def place_order(request):
     """Handle order placement"""
+    # A genuine checkout payload is a few KB; refuse to parse anything huge
+    if len(request.body) > 64 * 1024:
+        return JsonResponse({'success': False, 'error': 'Payload too large'}, status=413)
+
     try:
         data = json.loads(request.body)
-        
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+
+    try:
         # Validate required fields
         required_fields = ['customer_name', 'phone', 'address_line', 'city', 'pincode', 'cart_items']
         for field in required_fields:
@@ -112,21 +143,75 @@ def place_order(request):
                 return JsonResponse({'success': False, 'error': f'{field} is required'}, status=400)
         
         cart_items = data.get('cart_items', [])
+        if not isinstance(cart_items, list):
+            return JsonResponse({'success': False, 'error': 'Invalid cart data'}, status=400)
         if not cart_items:
             return JsonResponse({'success': False, 'error': 'Cart is empty'}, status=400)
         
+        # Batch-fetch everything the cart references up front instead of
+        # issuing one query per cart line; reject malformed ids here with a
+        # clean 400 rather than letting them blow up inside the ORM
+        product_ids = []
+        variant_ids = []
+        combo_ids = []
+        for item in cart_items:
+            if not isinstance(item, dict):
+                return JsonResponse({'success': False, 'error': 'Invalid cart data'}, status=400)
+
+            item_type = item.get('type')
+            if item_type not in ('product', 'combo'):
+                return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
+
+            try:
+                item['quantity'] = int(item.get('quantity', 1))
+            except (TypeError, ValueError):
+                return JsonResponse({'success': False, 'error': 'Invalid quantity'}, status=400)
+            if item['quantity'] < 1:
+                return JsonResponse({'success': False, 'error': 'Invalid quantity'}, status=400)
+
+            parsed_id = _parse_uuid(item.get('id'))
+            if not parsed_id:
+                return JsonResponse({'success': False, 'error': f'Invalid {item_type} id'}, status=400)
+            # Store the canonical form so the batch-map lookups below match
+            # whatever spelling the client sent (uppercase, no dashes, ...)
+            item['id'] = str(parsed_id)
+
+            if item_type == 'product':
+                product_ids.append(parsed_id)
+                if item.get('variant_id'):
+                    parsed_variant_id = _parse_uuid(item['variant_id'])
+                    if not parsed_variant_id:
+                        return JsonResponse({'success': False, 'error': 'Invalid variant id'}, status=400)
+                    item['variant_id'] = str(parsed_variant_id)
+                    variant_ids.append(parsed_variant_id)
+            else:
+                combo_ids.append(parsed_id)
+
+        products = {str(p.id): p for p in Product.objects.filter(id__in=product_ids)}
+        variants = {str(v.id): v for v in ProductVariant.objects.filter(id__in=variant_ids)}
+        combos = {
+            str(c.id): c
+            for c in Combo.objects.filter(id__in=combo_ids).prefetch_related(
+                'combo_products__variant'
+            )
+        }
+
         # Calculate total
         total_amount = 0
         order_items_data = []
-        
+
         for item in cart_items:
             if item['type'] == 'product':
-                product = Product.objects.get(id=item['id'])
+                product = products.get(str(item['id']))
+                if not product:
+                    raise Product.DoesNotExist
                 variant_id = item.get('variant_id')
                 if not variant_id:
                     return JsonResponse({'success': False, 'error': 'Variant is required for product'}, status=400)
 
-                variant = ProductVariant.objects.get(id=variant_id, product=product)
+                variant = variants.get(str(variant_id))
+                if not variant or variant.product_id != product.id:
+                    raise ProductVariant.DoesNotExist
                 price = variant.price
                 order_items_data.append({
                     'type': 'product',
@@ -136,7 +221,9 @@ def place_order(request):
                     'price': price
                 })
             elif item['type'] == 'combo':
-                combo = Combo.objects.get(id=item['id'])
+                combo = combos.get(str(item['id']))
+                if not combo:
+                    raise Combo.DoesNotExist
                 price = combo.discounted_price()
                 order_items_data.append({
                     'type': 'combo',
@@ -147,28 +234,31 @@ def place_order(request):
             
             total_amount += price * item['quantity']
         
-        # Create order
-        order = Order.objects.create(
-            customer_name=data['customer_name'],
-            phone=data['phone'],
-            address_line=data['address_line'],
-            city=data['city'],
-            pincode=data['pincode'],
-            total_amount=total_amount
-        )
-        
-        # Create order items
-        for item_data in order_items_data:
-            OrderItem.objects.create(
-                order=order,
-                item_type=item_data['type'],
-                product=item_data.get('product'),
-                combo=item_data.get('combo'),
-                variant=item_data.get('variant'),
-                variant_ml=getattr(item_data.get('variant'), 'ml', None),
-                quantity=item_data['quantity'],
-                price_at_purchase=item_data['price']
+        # Create order and its items atomically so a failure mid-way
+        # never leaves an order without its line items
+        with transaction.atomic():
+            order = Order.objects.create(
+                customer_name=data['customer_name'],
+                phone=data['phone'],
+                address_line=data['address_line'],
+                city=data['city'],
+                pincode=data['pincode'],
+                total_amount=total_amount
             )
+
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    item_type=item_data['type'],
+                    product=item_data.get('product'),
+                    combo=item_data.get('combo'),
+                    variant=item_data.get('variant'),
+                    variant_ml=getattr(item_data.get('variant'), 'ml', None),
+                    quantity=item_data['quantity'],
+                    price_at_purchase=item_data['price']
+                )
+                for item_data in order_items_data
+            ])
         
         return JsonResponse({
             'success': True,
@@ -182,17 +272,15 @@ def place_order(request):
         return JsonResponse({'success': False, 'error': 'Product variant not found'}, status=404)
     except Combo.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Combo not found'}, status=404)
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    except (KeyError, TypeError, ValueError, AttributeError, ValidationError):
+        return JsonResponse({'success': False, 'error': 'Invalid cart data'}, status=400)
 
 
 def order_confirmation(request, order_number):
     """Order confirmation page"""
     order = get_object_or_404(Order, order_number=order_number)
-    site_config = get_site_config()
-    
+
     context = {
         'order': order,
-        'site_config': site_config,
     }
     return render(request, 'store/order_confirmation.html', context)
\ No newline at end of file